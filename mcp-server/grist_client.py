@@ -6,12 +6,42 @@ Handles Grist API key authentication, error handling, and response transformatio
 """
 
 import os
+import re
 import json
-import requests
-from typing import Dict, Any, Optional, List
+import asyncio
+import functools
+import httpx
+import orjson
+from cachetools import TTLCache
+from typing import Dict, Any, Optional, List, Tuple, Iterable, FrozenSet
 
 _ACTIVE_CONTEXT_DOC_ID: Optional[str] = None
 
+# HTTP methods accepted by make_grist_request
+_SUPPORTED_METHODS = frozenset({"GET", "POST", "PATCH", "DELETE"})
+
+# Timeouts in seconds. The pool timeout bounds how long a call waits for a free
+# connection, so a stuck Grist endpoint fails fast instead of queueing forever.
+_TIMEOUT = httpx.Timeout(connect=5.0, read=30.0, write=30.0, pool=5.0)
+
+# In-flight GET requests keyed by (doc_id, endpoint, params), for coalescing
+_INFLIGHT: Dict[Tuple[str, str, bytes], "asyncio.Future[Dict[str, Any]]"] = {}
+
+# Short-TTL cache for metadata reads that rarely change (table and column listings)
+_CACHEABLE_ENDPOINTS = (
+    re.compile(r"^/tables/?$"),
+    re.compile(r"^/tables/[^/]+/columns/?$"),
+)
+_RESPONSE_CACHE: "TTLCache[Tuple[str, str, bytes], Dict[str, Any]]" = TTLCache(maxsize=512, ttl=15)
+
+# Per-document write counter; a GET's response is cached only if no write to
+# its document completed while it was in flight
+_DOC_GENERATIONS: Dict[str, int] = {}
+
+# Shared async HTTP client so connections to Grist are pooled and kept alive
+# (HTTP/1.1 keep-alive, or HTTP/2 when the Grist host negotiates it)
+_CLIENT: Optional[httpx.AsyncClient] = None
+
 
 def get_grist_auth_header() -> Dict[str, str]:
     """
@@ -44,6 +74,17 @@ def get_allowed_docs() -> List[Dict[str, str]]:
     if not raw:
         return []
 
+    return [dict(doc) for doc in _parse_allowed_docs(raw)]
+
+
+@functools.lru_cache(maxsize=1)
+def _parse_allowed_docs(raw: str) -> Tuple[Dict[str, str], ...]:
+    """
+    Parse and validate the allowlist JSON.
+
+    Cached on the raw env string so the JSON is only parsed again if the
+    variable changes.
+    """
     try:
         parsed = json.loads(raw)
     except json.JSONDecodeError as e:
@@ -64,12 +105,22 @@ def get_allowed_docs() -> List[Dict[str, str]]:
             name = doc_id
         docs.append({"id": doc_id.strip(), "name": name.strip()})
 
-    return docs
+    return tuple(docs)
 
 
 def get_allowed_doc_ids() -> List[str]:
     """Return allowlisted document IDs from GRIST_ALLOWED_DOCS_JSON."""
-    return [doc["id"] for doc in get_allowed_docs()]
+    raw = os.getenv("GRIST_ALLOWED_DOCS_JSON", "").strip()
+    if not raw:
+        return []
+
+    return [doc["id"] for doc in _parse_allowed_docs(raw)]
+
+
+@functools.lru_cache(maxsize=1)
+def _allowed_doc_id_set(raw: str) -> FrozenSet[str]:
+    """Frozen set of allowlisted doc IDs, cached on the raw env string."""
+    return frozenset(doc["id"] for doc in _parse_allowed_docs(raw))
 
 
 def get_default_doc_id() -> str:
@@ -97,8 +148,9 @@ def resolve_doc_id(request_doc_id: Optional[str] = None) -> str:
     if not effective_doc:
         raise ValueError("GRIST_DOC_ID environment variable is not set and no doc_id was provided")
 
-    allowed_ids = set(get_allowed_doc_ids())
-    if allowed_ids and effective_doc not in allowed_ids:
+    # No allowlist configured means any document is allowed
+    raw_allowlist = os.getenv("GRIST_ALLOWED_DOCS_JSON", "").strip()
+    if raw_allowlist and effective_doc not in _allowed_doc_id_set(raw_allowlist):
         raise ValueError("doc_id is not allowed")
 
     return effective_doc
@@ -116,21 +168,85 @@ def set_active_context_doc_id(doc_id: str) -> str:
     return _ACTIVE_CONTEXT_DOC_ID
 
 
+def create_client() -> httpx.AsyncClient:
+    """
+    Create an async HTTP client configured for the Grist API.
+
+    The caller owns the returned client and is responsible for closing it
+    (e.g. with ``async with``). Most code should use the shared client from
+    init_client() instead.
+
+    Returns:
+        A new httpx.AsyncClient with base URL, auth headers, and pool limits set
+    """
+    # Auth headers are attached once here rather than rebuilt per request
+    headers = get_grist_auth_header()
+    headers["Content-Type"] = "application/json"
+
+    # GRIST_API_URL is constant for the process; resolve it once as the base URL
+    base_url = os.getenv("GRIST_API_URL", "https://docs.getgrist.com").rstrip('/')
+
+    return httpx.AsyncClient(
+        base_url=base_url,
+        headers=headers,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+        timeout=_TIMEOUT,
+        # Multiplex concurrent requests over one persistent connection where supported
+        http2=True
+    )
+
+
+def init_client() -> httpx.AsyncClient:
+    """
+    Create the shared async HTTP client used for all Grist API requests.
+
+    Called from the server startup hook. Safe to call more than once;
+    an existing client is reused.
+
+    Returns:
+        The shared httpx.AsyncClient
+    """
+    global _CLIENT
+
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = create_client()
+
+    return _CLIENT
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client and release pooled connections."""
+    global _CLIENT
+
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
+
 async def make_grist_request(
     method: str,
     endpoint: str,
     data: Optional[Dict[str, Any]] = None,
     params: Optional[Dict[str, Any]] = None,
-    doc_id: Optional[str] = None
+    doc_id: Optional[str] = None,
+    client: Optional[httpx.AsyncClient] = None
 ) -> Dict[str, Any]:
     """
     Make authenticated request to Grist REST API.
 
+    Identical GET requests that are already in flight are coalesced: later
+    callers await the same response instead of issuing another round trip.
+    Table and column listings are additionally cached for a few seconds, and
+    writes invalidate cached entries for the table they touch. The returned
+    dict may therefore be shared and must not be mutated.
+
     Args:
         method: HTTP method (GET, POST, PATCH, DELETE)
         endpoint: API endpoint path (e.g., '/tables', '/tables/TableName/records')
         data: Optional request body data for POST/PATCH requests
         params: Optional query parameters for GET requests
+        doc_id: Optional document ID; resolved via resolve_doc_id()
+        client: Optional client from create_client(); defaults to the shared client
 
     Returns:
         JSON response from Grist API
@@ -143,32 +259,145 @@ async def make_grist_request(
         result = await make_grist_request('POST', '/tables/Customers/records',
                                           data={'records': [{'fields': {...}}]})
     """
-    grist_api_url = os.getenv("GRIST_API_URL", "https://docs.getgrist.com")
     grist_doc_id = resolve_doc_id(doc_id)
 
-    # Build full URL
-    base_url = grist_api_url.rstrip('/')
-    full_url = f"{base_url}/api/docs/{grist_doc_id}{endpoint}"
+    # Reuse pooled connections (created lazily for scripts that skip server startup)
+    if client is None:
+        client = init_client()
+
+    # Path relative to the client's base URL
+    doc_path = f"/api/docs/{grist_doc_id}{endpoint}"
+
+    http_method = method.upper()
+    if http_method not in _SUPPORTED_METHODS:
+        raise ValueError(f"Unsupported HTTP method: {method}")
+
+    if http_method != "GET":
+        try:
+            return await _send_request(client, http_method, endpoint, doc_path, data, params)
+        finally:
+            _DOC_GENERATIONS[grist_doc_id] = _DOC_GENERATIONS.get(grist_doc_id, 0) + 1
+            _invalidate_cached_responses(grist_doc_id, endpoint)
+
+    key = (
+        grist_doc_id,
+        endpoint,
+        orjson.dumps(params, option=orjson.OPT_SORT_KEYS) if params else b""
+    )
+
+    cacheable = any(pattern.match(endpoint) for pattern in _CACHEABLE_ENDPOINTS)
+    if cacheable:
+        cached = _RESPONSE_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+    # Attach to an identical in-flight GET if there is one
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_send_request(client, http_method, endpoint, doc_path, None, params))
+        _INFLIGHT[key] = task
+        generation = _DOC_GENERATIONS.get(grist_doc_id, 0) if cacheable else None
+        task.add_done_callback(functools.partial(_on_inflight_done, key, generation))
+
+    # Shield so one caller being cancelled does not cancel the shared request
+    return await asyncio.shield(task)
+
+
+def _on_inflight_done(
+    key: Tuple[str, str, bytes],
+    generation: Optional[int],
+    task: "asyncio.Future[Dict[str, Any]]"
+) -> None:
+    """
+    Remove a finished GET from _INFLIGHT and cache its response if still fresh.
 
-    # Get Grist auth headers
-    headers = get_grist_auth_header()
-    headers["Content-Type"] = "application/json"
+    generation is the document's write counter when the request was sent, or
+    None if the endpoint is not cacheable.
+    """
+    # A write may have detached this task and a newer GET taken its key
+    if _INFLIGHT.get(key) is task:
+        del _INFLIGHT[key]
+
+    if task.cancelled():
+        return
+
+    # Detached tasks can finish with no waiters left; retrieve the exception so
+    # asyncio does not log "Task exception was never retrieved"
+    if task.exception() is not None:
+        return
+
+    # Skip caching if a write completed while the request was in flight
+    if generation is not None and _DOC_GENERATIONS.get(key[0], 0) == generation:
+        _RESPONSE_CACHE[key] = task.result()
+
+
+def _invalidate_cached_responses(doc_id: str, endpoint: str) -> None:
+    """
+    Drop cached and in-flight reads affected by a write to endpoint.
+
+    Writes under /tables/{table} drop that table's entries; writes that are
+    not record writes (schema changes) also drop the table listing. In-flight
+    GETs are detached rather than cancelled: their current waiters still get
+    a response, but later callers send a fresh request that sees the write.
+    """
+    parts = endpoint.strip('/').split('/')
+    if not parts or parts[0] != "tables":
+        return
+
+    table_prefix = f"/tables/{parts[1]}" if len(parts) > 1 else None
+    schema_change = len(parts) < 3 or parts[2] != "records"
+
+    for entries in (_RESPONSE_CACHE, _INFLIGHT):
+        for key in list(entries.keys()):
+            cached_doc, cached_endpoint, _ = key
+            if cached_doc != doc_id:
+                continue
+            if table_prefix and cached_endpoint.startswith(table_prefix + "/"):
+                entries.pop(key, None)
+            elif schema_change and cached_endpoint.rstrip('/') == "/tables":
+                entries.pop(key, None)
 
-    # Set timeout for all requests
-    timeout = 30
 
+def invalidate_tables_cache(doc_id: Optional[str] = None) -> None:
+    """
+    Drop cached table and column listings.
+
+    Writes made through make_grist_request invalidate what they touch; call
+    this after changing a document's schema by any other route. GETs already
+    in flight for the document are detached, as for writes, so later callers
+    send a fresh request.
+
+    Args:
+        doc_id: Document whose listings to drop. If None, clears every document.
+    """
+    # Keep responses already in flight from repopulating the cache
+    for inflight_doc in {key[0] for key in _INFLIGHT} if doc_id is None else {doc_id}:
+        _DOC_GENERATIONS[inflight_doc] = _DOC_GENERATIONS.get(inflight_doc, 0) + 1
+
+    if doc_id is None:
+        _RESPONSE_CACHE.clear()
+        _INFLIGHT.clear()
+        return
+
+    for entries in (_RESPONSE_CACHE, _INFLIGHT):
+        for key in list(entries.keys()):
+            if key[0] == doc_id:
+                entries.pop(key, None)
+
+
+async def _send_request(
+    client: httpx.AsyncClient,
+    http_method: str,
+    endpoint: str,
+    doc_path: str,
+    data: Optional[Dict[str, Any]],
+    params: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Send a single request to Grist and translate errors to ValueError."""
     try:
-        # Make request based on method
-        if method.upper() == "GET":
-            response = requests.get(full_url, headers=headers, params=params, timeout=timeout)
-        elif method.upper() == "POST":
-            response = requests.post(full_url, headers=headers, json=data, timeout=timeout)
-        elif method.upper() == "PATCH":
-            response = requests.patch(full_url, headers=headers, json=data, timeout=timeout)
-        elif method.upper() == "DELETE":
-            response = requests.delete(full_url, headers=headers, json=data, timeout=timeout)
-        else:
-            raise ValueError(f"Unsupported HTTP method: {method}")
+        # Encode bodies with orjson rather than letting httpx use stdlib json
+        content = orjson.dumps(data) if data is not None else None
+        response = await client.request(http_method, doc_path, content=content, params=params)
 
         # Handle HTTP errors with specific messages
         if response.status_code == 401:
@@ -183,22 +412,34 @@ async def make_grist_request(
             # Other HTTP errors
             error_msg = f"Grist API error: {response.status_code}"
             try:
-                error_data = response.json()
+                error_data = orjson.loads(response.content)
+            except orjson.JSONDecodeError:
+                error_data = None
+            if isinstance(error_data, dict):
                 if "error" in error_data:
                     error_msg = f"{error_msg} - {error_data['error']}"
                 elif "message" in error_data:
                     error_msg = f"{error_msg} - {error_data['message']}"
-            except:
-                pass
             raise ValueError(error_msg)
 
         # Return JSON response
-        return response.json()
-
-    except requests.exceptions.ConnectionError as e:
-        raise ValueError(f"Unable to connect to Grist instance at {grist_api_url}")
-    except requests.exceptions.Timeout as e:
-        raise ValueError(f"Grist API request timed out after {timeout} seconds")
+        return orjson.loads(response.content)
+
+    except httpx.ConnectError as e:
+        raise ValueError(f"Unable to connect to Grist instance at {client.base_url}")
+    except httpx.PoolTimeout as e:
+        raise ValueError("Grist API pool exhausted - too many concurrent requests")
+    except httpx.ConnectTimeout as e:
+        raise ValueError(
+            f"Timed out connecting to Grist instance at {client.base_url} "
+            f"after {client.timeout.connect:g} seconds"
+        )
+    except httpx.WriteTimeout as e:
+        raise ValueError(f"Grist API request timed out sending data after {client.timeout.write:g} seconds")
+    except httpx.ReadTimeout as e:
+        raise ValueError(f"Grist API request timed out after {client.timeout.read:g} seconds")
+    except httpx.TimeoutException as e:
+        raise ValueError("Grist API request timed out")
     except ValueError:
         # Re-raise ValueError exceptions (our custom error messages)
         raise
@@ -228,6 +469,26 @@ def transform_table_response(grist_table: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def transform_tables(grist_tables: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Transform a list of Grist API tables in one pass.
+
+    Equivalent to calling transform_table_response on each table, without the
+    per-table function calls.
+
+    Args:
+        grist_tables: Raw Grist API tables
+
+    Returns:
+        List of simplified table dicts with id and name
+    """
+    simplified = []
+    for table in grist_tables:
+        table_id = table.get("id", "")
+        simplified.append({"id": table_id, "name": table_id})  # Grist uses id as table name
+    return simplified
+
+
 def transform_record_response(grist_record: Dict[str, Any]) -> Dict[str, Any]:
     """
     Transform Grist API record response to simplified format.
@@ -249,13 +510,51 @@ def transform_record_response(grist_record: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def filter_record_fields(record: Dict[str, Any], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+def transform_records(
+    grist_records: List[Dict[str, Any]],
+    fields: Optional[Iterable[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Transform and optionally filter a list of Grist API records in one pass.
+
+    Equivalent to calling transform_record_response and filter_record_fields
+    on each record, without the per-record function calls.
+
+    Args:
+        grist_records: Raw Grist API records
+        fields: Field names to include. If None, returns all fields.
+
+    Returns:
+        List of record dicts with id and fields
+
+    Example:
+        transform_records([{"id": 1, "fields": {"Name": "John", "Phone": "555"}}], ["Name"])
+        # Returns: [{"id": 1, "fields": {"Name": "John"}}]
+    """
+    if fields is None:
+        return [
+            {"id": record.get("id", 0), "fields": record.get("fields", {})}
+            for record in grist_records
+        ]
+
+    wanted = fields if isinstance(fields, frozenset) else frozenset(fields)
+    return [
+        {
+            "id": record.get("id", 0),
+            "fields": {key: value for key, value in record.get("fields", {}).items() if key in wanted}
+        }
+        for record in grist_records
+    ]
+
+
+def filter_record_fields(record: Dict[str, Any], fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
     """
     Filter record object to include only specified fields.
 
     Args:
         record: Transformed record dict with id and fields
-        fields: List of field names to include. If None, returns all fields.
+        fields: Field names to include. If None, returns all fields. Pass a
+            frozenset when filtering many records to avoid rebuilding it per call.
 
     Returns:
         Record dict with only requested fields
@@ -268,8 +567,10 @@ def filter_record_fields(record: Dict[str, Any], fields: Optional[List[str]] = N
     if fields is None:
         return record
 
+    wanted = fields if isinstance(fields, frozenset) else frozenset(fields)
+
     # Filter fields to only include requested ones
-    filtered_fields = {key: record["fields"][key] for key in fields if key in record["fields"]}
+    filtered_fields = {key: value for key, value in record["fields"].items() if key in wanted}
 
     return {
         "id": record["id"],
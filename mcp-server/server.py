@@ -7,17 +7,23 @@ Grist documents via REST API for managing tables and records (CRUD operations).
 
 import os
 import sys
-import json
+import time
+import logging
+import functools
+import orjson
 from typing import Dict, Any
 from datetime import datetime
 
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import FastAPI, Request, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from dotenv import load_dotenv
 
+from grist_client import init_client, close_client
+from tools import get_tool_registry, execute_tool
+
 # Load environment variables
 load_dotenv()
 
@@ -47,6 +53,32 @@ GRIST_API_URL = os.getenv("GRIST_API_URL", "https://docs.getgrist.com")
 MCP_SERVER_HOST = os.getenv("MCP_SERVER_HOST", "0.0.0.0")
 MCP_SERVER_PORT = int(os.getenv("MCP_SERVER_PORT", "8001"))
 
+# Logging (set MCP_LOG_LEVEL=DEBUG to log incoming MCP request bodies).
+# The level applies to this server's logger only; the root logger stays at
+# WARNING so httpx does not log every Grist request URL (doc IDs, filters).
+MCP_LOG_LEVELS = ("CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG")
+MCP_LOG_LEVEL = os.getenv("MCP_LOG_LEVEL", "INFO").strip().upper()
+if MCP_LOG_LEVEL not in MCP_LOG_LEVELS:
+    print(f"ERROR: MCP_LOG_LEVEL must be one of {', '.join(MCP_LOG_LEVELS)}")
+    print("Please fix MCP_LOG_LEVEL in your .env file")
+    sys.exit(1)
+
+logging.basicConfig()
+logger = logging.getLogger("grist_mcp")
+logger.setLevel(MCP_LOG_LEVEL)
+
+# MCP tools/list result - the tool registry is static, so build it once
+TOOLS_LIST_RESULT = {
+    "tools": [
+        {
+            "name": name,
+            "description": tool.description,
+            "inputSchema": tool.schema
+        }
+        for name, tool in get_tool_registry().items()
+    ]
+}
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Grist MCP Server",
@@ -74,6 +106,34 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+async def startup():
+    """Open the pooled Grist API client."""
+    init_client()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Close the pooled Grist API client."""
+    await close_client()
+
+
+@functools.lru_cache(maxsize=1)
+def _timestamp_for_second(second: int) -> str:
+    """ISO timestamp for a given epoch second (cached so it is built once per second)."""
+    return datetime.fromtimestamp(second).isoformat()
+
+
+def current_timestamp() -> str:
+    """Return the current time as an ISO string, at one-second resolution."""
+    return _timestamp_for_second(int(time.time()))
+
+
+def json_response(payload: Dict[str, Any]) -> Response:
+    """Serialize a JSON-RPC payload with orjson, bypassing FastAPI's encoder."""
+    return Response(content=orjson.dumps(payload), media_type="application/json")
+
+
 @app.get("/")
 async def root_get():
     """Root endpoint info - GET requests."""
@@ -81,7 +141,7 @@ async def root_get():
         "service": "Grist MCP Server",
         "status": "running",
         "version": "1.0.0",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": current_timestamp(),
         "endpoints": {
             "health": "/health",
             "mcp_protocol": "POST / with JSON-RPC 2.0",
@@ -96,7 +156,8 @@ async def root_get():
             "grist_list_records",
             "grist_create_records",
             "grist_update_records",
-            "grist_delete_records"
+            "grist_delete_records",
+            "grist_bulk"
         ],
         "grist_config": {
             "api_url": GRIST_API_URL,
@@ -136,9 +197,10 @@ async def mcp_protocol_handler(request: Request):
 
     # Parse request body as JSON-RPC 2.0
     try:
-        body_json = await request.json()
-        # Log the request for debugging
-        print(f"[MCP] Request: {json.dumps(body_json, indent=2)}")
+        body_json = orjson.loads(await request.body())
+        # Log the request for debugging (skipped entirely unless DEBUG is enabled)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[MCP] Request: %s", orjson.dumps(body_json, option=orjson.OPT_INDENT_2).decode())
     except Exception as e:
         raise HTTPException(status_code=400, detail="Invalid JSON request body")
 
@@ -146,31 +208,31 @@ async def mcp_protocol_handler(request: Request):
     params = body_json.get("params", {})
     request_id = body_json.get("id")  # JSON-RPC request ID (None for notifications)
 
-    # Check if this is a notification (no id field) - these don't need a full response
+    # Check if this is a notification (no id field) - JSON-RPC sends no response body for these
     is_notification = request_id is None
 
     # Helper function to create JSON-RPC response
     def jsonrpc_response(result):
         if is_notification:
-            return {"status": "acknowledged"}
-        return {
+            return Response(status_code=204)
+        return json_response({
             "jsonrpc": "2.0",
             "id": request_id,
             "result": result
-        }
+        })
 
     # Helper function to create JSON-RPC error response
     def jsonrpc_error(code, message, data=None):
         if is_notification:
-            return {"status": "error", "message": message}
+            return Response(status_code=204)
         error = {"code": code, "message": message}
         if data:
             error["data"] = data
-        return {
+        return json_response({
             "jsonrpc": "2.0",
             "id": request_id,
             "error": error
-        }
+        })
 
     # Handle MCP methods
     if method == "initialize":
@@ -186,27 +248,11 @@ async def mcp_protocol_handler(request: Request):
         })
 
     elif method == "notifications/initialized":
-        # This is a notification that initialization is complete
-        return {"status": "acknowledged"}
+        # This is a notification that initialization is complete - no body needed
+        return Response(status_code=204)
 
     elif method == "tools/list":
-        # Import tools module and get registry
-        from tools import get_tool_registry
-
-        # Get Grist tool registry
-        grist_tools = get_tool_registry()
-
-        # Transform registry to MCP tools list format
-        tools_list = [
-            {
-                "name": name,
-                "description": tool["description"],
-                "inputSchema": tool["schema"]
-            }
-            for name, tool in grist_tools.items()
-        ]
-
-        return jsonrpc_response({"tools": tools_list})
+        return jsonrpc_response(TOOLS_LIST_RESULT)
 
     elif method == "tools/call":
         # Extract tool name and arguments from params
@@ -219,7 +265,6 @@ async def mcp_protocol_handler(request: Request):
 
         # Execute the tool
         try:
-            from tools import execute_tool
             result = await execute_tool(tool_name, arguments)
 
             # Wrap result in MCP format
@@ -227,7 +272,7 @@ async def mcp_protocol_handler(request: Request):
                 "content": [
                     {
                         "type": "text",
-                        "text": json.dumps(result, indent=2)
+                        "text": orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
                     }
                 ]
             })
@@ -240,7 +285,7 @@ async def mcp_protocol_handler(request: Request):
 
     # Handle other notification methods gracefully
     elif method and method.startswith("notifications/"):
-        return {"status": "acknowledged"}
+        return Response(status_code=204)
 
     else:
         return jsonrpc_error(-32601, "Method not found", f"Unknown method: {method}")
@@ -251,7 +296,7 @@ async def health_check():
     """Health check endpoint for monitoring."""
     return {
         "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": current_timestamp(),
         "grist_configured": bool(GRIST_API_KEY and GRIST_DOC_ID)
     }
 
@@ -0,0 +1,53 @@
+"""
+Shared fixtures for the Grist MCP server tests.
+"""
+
+import pytest
+
+import grist_client
+import tools
+
+
+def _clear_client_state() -> None:
+    grist_client._INFLIGHT.clear()
+    grist_client._RESPONSE_CACHE.clear()
+    grist_client._DOC_GENERATIONS.clear()
+
+
+@pytest.fixture(autouse=True)
+def grist_env(monkeypatch):
+    """Point the client at a test document and reset module-level state."""
+    monkeypatch.setenv("GRIST_API_KEY", "test-key")
+    monkeypatch.setenv("GRIST_DOC_ID", "doc1")
+    monkeypatch.setenv("GRIST_API_URL", "https://grist.example.com")
+    monkeypatch.delenv("GRIST_ALLOWED_DOCS_JSON", raising=False)
+    monkeypatch.setattr(grist_client, "_ACTIVE_CONTEXT_DOC_ID", None)
+    monkeypatch.setattr(grist_client, "_CLIENT", None)
+    monkeypatch.setattr(tools, "_API_SEMAPHORE", None)
+
+    _clear_client_state()
+    yield
+    _clear_client_state()
+
+
+@pytest.fixture
+def grist_calls(monkeypatch):
+    """
+    Replace make_grist_request in tools with a recorder.
+
+    Requests to a table named "missing" fail the way Grist 404s do.
+    """
+    calls = []
+
+    async def fake_request(method, endpoint, data=None, params=None, doc_id=None):
+        calls.append({"method": method, "endpoint": endpoint, "data": data, "params": params, "doc_id": doc_id})
+        if endpoint.startswith("/tables/missing/"):
+            raise ValueError("Resource 'missing' not found in Grist document")
+        if method == "POST":
+            return {"records": [{"id": index + 1} for index, _ in enumerate(data["records"])]}
+        if method == "GET" and endpoint.endswith("/records"):
+            return {"records": [{"id": 1, "fields": {"Name": "Ada", "Status": "Open", "Notes": "long text"}}]}
+        return {"records": [], "tables": []}
+
+    monkeypatch.setattr(tools, "make_grist_request", fake_request)
+    return calls
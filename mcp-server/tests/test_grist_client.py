@@ -0,0 +1,197 @@
+"""
+Tests for request coalescing, response caching and doc allowlisting in grist_client.
+"""
+
+import re
+import asyncio
+
+import httpx
+import orjson
+import pytest
+
+from grist_client import make_grist_request, invalidate_tables_cache, resolve_doc_id
+
+
+class FakeGrist:
+    """
+    MockTransport handler for one document whose tables and records change on writes.
+
+    While hold is set, GET responses are snapshotted on arrival (signalled by
+    arrived) but not returned until release is set, so tests can interleave
+    writes.
+    """
+
+    def __init__(self):
+        self.tables = ["T1"]
+        self.value = "old"
+        self.gets = 0
+        self.hold = False
+        self.arrived = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            self.gets += 1
+            if request.url.path.endswith("/records"):
+                payload = {"records": [{"id": 1, "fields": {"A": self.value}}]}
+            else:
+                payload = {"tables": [{"id": table_id} for table_id in self.tables]}
+            self.arrived.set()
+            if self.hold:
+                await self.release.wait()
+            return httpx.Response(200, content=orjson.dumps(payload))
+
+        if request.url.path.endswith("/records"):
+            self.value = "new"
+        else:
+            self.tables.append("T2")
+        return httpx.Response(200, content=b"{}")
+
+
+@pytest.fixture
+def fake_grist():
+    return FakeGrist()
+
+
+@pytest.fixture
+def client(fake_grist):
+    return httpx.AsyncClient(base_url="https://grist.example.com", transport=httpx.MockTransport(fake_grist))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_gets_share_one_request(client, fake_grist):
+    first, second = await asyncio.gather(
+        make_grist_request("GET", "/tables/T1/records", params={"limit": 10}, client=client),
+        make_grist_request("GET", "/tables/T1/records", params={"limit": 10}, client=client)
+    )
+
+    assert first == second
+    assert fake_grist.gets == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("read_endpoint, write_method, write_endpoint, fresh", [
+    ("/tables", "POST", "/tables", {"tables": [{"id": "T1"}, {"id": "T2"}]}),
+    ("/tables/T1/records", "PATCH", "/tables/T1/records", {"records": [{"id": 1, "fields": {"A": "new"}}]}),
+])
+async def test_get_after_write_does_not_join_request_sent_before_it(
+    client, fake_grist, read_endpoint, write_method, write_endpoint, fresh
+):
+    fake_grist.hold = True
+    stale = asyncio.ensure_future(make_grist_request("GET", read_endpoint, client=client))
+    await fake_grist.arrived.wait()
+
+    await make_grist_request(write_method, write_endpoint, data={}, client=client)
+    after_write = asyncio.ensure_future(make_grist_request("GET", read_endpoint, client=client))
+    await asyncio.sleep(0)
+    fake_grist.release.set()
+
+    assert await after_write == fresh
+    assert await stale != fresh
+    assert fake_grist.gets == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("doc_id", ["doc1", None])
+async def test_get_after_invalidate_does_not_join_request_sent_before_it(client, fake_grist, doc_id):
+    fake_grist.hold = True
+    stale = asyncio.ensure_future(make_grist_request("GET", "/tables", client=client))
+    await fake_grist.arrived.wait()
+
+    # Schema changed by another route, e.g. the Grist UI
+    fake_grist.tables.append("T2")
+    invalidate_tables_cache(doc_id)
+    after_invalidate = asyncio.ensure_future(make_grist_request("GET", "/tables", client=client))
+    await asyncio.sleep(0)
+    fake_grist.release.set()
+
+    assert await after_invalidate == {"tables": [{"id": "T1"}, {"id": "T2"}]}
+    assert await stale == {"tables": [{"id": "T1"}]}
+    assert await make_grist_request("GET", "/tables", client=client) == {"tables": [{"id": "T1"}, {"id": "T2"}]}
+    assert fake_grist.gets == 2
+
+
+@pytest.mark.asyncio
+async def test_response_sent_before_write_is_not_cached(client, fake_grist):
+    fake_grist.hold = True
+    stale = asyncio.ensure_future(make_grist_request("GET", "/tables", client=client))
+    await fake_grist.arrived.wait()
+
+    await make_grist_request("POST", "/tables", data={}, client=client)
+    fake_grist.release.set()
+    await stale
+
+    assert await make_grist_request("GET", "/tables", client=client) == {
+        "tables": [{"id": "T1"}, {"id": "T2"}]
+    }
+    assert fake_grist.gets == 2
+
+
+@pytest.mark.asyncio
+async def test_table_listing_is_cached_until_a_write(client, fake_grist):
+    await make_grist_request("GET", "/tables", client=client)
+    await make_grist_request("GET", "/tables", client=client)
+    assert fake_grist.gets == 1
+
+    await make_grist_request("POST", "/tables", data={}, client=client)
+    response = await make_grist_request("GET", "/tables", client=client)
+
+    assert response == {"tables": [{"id": "T1"}, {"id": "T2"}]}
+    assert fake_grist.gets == 2
+
+
+@pytest.mark.asyncio
+async def test_record_reads_are_not_cached(client, fake_grist):
+    await make_grist_request("GET", "/tables/T1/records", client=client)
+    await make_grist_request("GET", "/tables/T1/records", client=client)
+
+    assert fake_grist.gets == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error, message", [
+    (httpx.ConnectTimeout("timeout"), "Timed out connecting to Grist instance at https://grist.example.com after 5 seconds"),
+    (httpx.ReadTimeout("timeout"), "Grist API request timed out after 30 seconds"),
+    (httpx.ConnectError("refused"), "Unable to connect to Grist instance at https://grist.example.com"),
+])
+async def test_transport_errors_become_value_errors(error, message):
+    def handler(request):
+        raise error
+
+    client = httpx.AsyncClient(
+        base_url="https://grist.example.com",
+        transport=httpx.MockTransport(handler),
+        timeout=httpx.Timeout(connect=5.0, read=30.0, write=30.0, pool=5.0)
+    )
+
+    with pytest.raises(ValueError, match=f"^{re.escape(message)}$"):
+        await make_grist_request("GET", "/tables", client=client)
+
+
+@pytest.mark.parametrize("requested, allowed", [
+    ("docB", True),
+    ("docX", False),
+    (None, True),
+])
+def test_resolve_doc_id_checks_allowlist(monkeypatch, requested, allowed):
+    monkeypatch.setenv("GRIST_ALLOWED_DOCS_JSON", '[{"id": "doc1"}, {"id": "docB"}]')
+
+    if allowed:
+        assert resolve_doc_id(requested) == (requested or "doc1")
+    else:
+        with pytest.raises(ValueError, match="^doc_id is not allowed$"):
+            resolve_doc_id(requested)
+
+
+def test_resolve_doc_id_follows_allowlist_changes(monkeypatch):
+    assert resolve_doc_id("docX") == "docX"
+
+    monkeypatch.setenv("GRIST_ALLOWED_DOCS_JSON", '[{"id": "docX"}]')
+    assert resolve_doc_id("docX") == "docX"
+    with pytest.raises(ValueError, match="^doc_id is not allowed$"):
+        resolve_doc_id()
+
+    monkeypatch.setenv("GRIST_ALLOWED_DOCS_JSON", '[{"id": "doc1"}]')
+    assert resolve_doc_id() == "doc1"
+    with pytest.raises(ValueError, match="^doc_id is not allowed$"):
+        resolve_doc_id("docX")
@@ -0,0 +1,67 @@
+"""
+Tests for JSON-RPC error mapping in the MCP endpoint and startup validation.
+"""
+
+import os
+import sys
+import importlib
+import subprocess
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def mcp_client(monkeypatch, grist_calls):
+    """TestClient for the server app; server checks its env at import time."""
+    monkeypatch.setenv("MCP_AUTH_TOKEN", "test-token")
+    server = importlib.import_module("server")
+    monkeypatch.setattr(server, "MCP_AUTH_TOKEN", "test-token")
+    with TestClient(server.app) as client:
+        yield client
+
+
+def call_tool(client, name, arguments):
+    response = client.post(
+        "/",
+        headers={"Authorization": "Bearer test-token"},
+        json={"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": name, "arguments": arguments}}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_schema_error_maps_to_invalid_params(mcp_client):
+    body = call_tool(mcp_client, "grist_delete_records", {"table_id": "T1", "record_ids": "[1.0]"})
+
+    assert body["error"] == {"code": -32602, "message": "Invalid params", "data": "record_ids[0] must be integer"}
+
+
+def test_json_string_arguments_succeed(mcp_client, grist_calls):
+    body = call_tool(mcp_client, "grist_delete_records", {"table_id": "T1", "record_ids": "[3, 4]"})
+
+    assert "error" not in body
+    assert grist_calls[0]["data"] == {"records": [3, 4]}
+
+
+@pytest.mark.parametrize("message", [
+    {"jsonrpc": "2.0", "method": "notifications/initialized"},
+    {"jsonrpc": "2.0", "method": "tools/call", "params": {"name": "grist_get_context", "arguments": {}}},
+])
+def test_notifications_get_empty_204(mcp_client, message):
+    response = mcp_client.post("/", headers={"Authorization": "Bearer test-token"}, json=message)
+
+    assert response.status_code == 204
+    assert response.content == b""
+
+
+def test_unknown_log_level_exits_at_startup():
+    env = dict(os.environ, MCP_AUTH_TOKEN="test-token", MCP_LOG_LEVEL="verbose")
+    result = subprocess.run(
+        [sys.executable, "-c", "import server"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env, capture_output=True, text=True
+    )
+
+    assert result.returncode == 1
+    assert result.stdout.startswith("ERROR: MCP_LOG_LEVEL must be one of CRITICAL, ERROR, WARNING, INFO, DEBUG")
@@ -0,0 +1,138 @@
+"""
+Tests for tool argument handling and the grist_bulk and update handlers.
+"""
+
+import pytest
+
+import tools
+from tools import execute_tool
+
+
+@pytest.mark.asyncio
+async def test_bulk_reports_failures_without_aborting_batch(grist_calls):
+    result = await execute_tool("grist_bulk", {
+        "operations": [
+            {"tool": "grist_list_records", "arguments": {"table_id": "T1"}},
+            {"tool": "grist_list_records", "arguments": {"table_id": "missing"}},
+            {"tool": "grist_get_context", "arguments": None},
+        ]
+    })
+
+    assert result["count"] == 3
+    assert result["failed"] == 1
+    assert [entry["ok"] for entry in result["results"]] == [True, False, True]
+    assert result["results"][1]["error"] == "Resource 'missing' not found in Grist document"
+
+
+@pytest.mark.asyncio
+async def test_bulk_decodes_string_arguments_per_operation(grist_calls):
+    result = await execute_tool("grist_bulk", {
+        "operations": [
+            {"tool": "grist_list_records", "arguments": '{"table_id": "T1", "limit": 5}'},
+            {"tool": "grist_list_records", "arguments": "{not json"},
+            {"tool": "grist_list_records", "arguments": "[1, 2]"},
+        ]
+    })
+
+    assert [entry["ok"] for entry in result["results"]] == [True, False, False]
+    assert result["results"][1]["error"].startswith("arguments parameter is a string but not valid JSON")
+    assert result["results"][2]["error"] == "Tool arguments must be an object"
+    assert grist_calls[0]["params"] == {"limit": 5}
+
+
+@pytest.mark.asyncio
+async def test_bulk_rejects_nested_bulk(grist_calls):
+    with pytest.raises(ValueError, match="grist_bulk operations cannot be nested"):
+        await execute_tool("grist_bulk", {
+            "operations": [
+                {"tool": "grist_get_context"},
+                {"tool": "grist_bulk", "arguments": {"operations": []}},
+            ]
+        })
+
+    assert grist_calls == []
+
+
+@pytest.mark.asyncio
+async def test_json_string_arguments_are_decoded(grist_calls):
+    result = await execute_tool("grist_update_records", {
+        "table_id": "T1",
+        "records": '[{"id": 56, "fields": {"Linkedin_Profile": "Not Found"}}]'
+    })
+
+    assert result["updated"] == 1
+    assert grist_calls[0]["data"] == {"records": [{"id": 56, "fields": {"Linkedin_Profile": "Not Found"}}]}
+
+
+@pytest.mark.asyncio
+async def test_invalid_json_string_argument_raises_value_error(grist_calls):
+    with pytest.raises(ValueError, match="records parameter is a string but not valid JSON"):
+        await execute_tool("grist_create_records", {"table_id": "T1", "records": "[{not json"})
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("tool_name, arguments, message", [
+    ("grist_create_records", {"table_id": "T1", "records": []}, "records must contain at least 1 items"),
+    ("grist_list_records", {"table_id": "T1", "limit": 501}, "limit must be smaller than or equal to 500"),
+    ("grist_list_records", {"table_id": "T1", "limit": 5.0}, "limit must be integer"),
+    ("grist_delete_records", {"table_id": "T1", "record_ids": [1.0]}, "record_ids[0] must be integer"),
+    ("grist_update_records", {"table_id": "T1", "records": [{"id": 1.0, "fields": {}}]}, "records[0].id must be integer"),
+])
+async def test_schema_errors_raise_value_error(grist_calls, tool_name, arguments, message):
+    with pytest.raises(ValueError) as excinfo:
+        await execute_tool(tool_name, arguments)
+
+    assert str(excinfo.value) == message
+    assert grist_calls == []
+
+
+@pytest.mark.asyncio
+async def test_list_records_sends_filter_as_json_and_projects_columns(grist_calls):
+    result = await execute_tool("grist_list_records", {
+        "table_id": "T1",
+        "filters": {"Status": ["Open"]},
+        "columns": ["Name", "Status"]
+    })
+
+    assert grist_calls[0]["params"] == {"limit": 100, "filter": '{"Status":["Open"]}'}
+    assert result["records"] == [{"id": 1, "fields": {"Name": "Ada", "Status": "Open"}}]
+
+
+@pytest.mark.asyncio
+async def test_list_records_without_columns_returns_all_fields(grist_calls):
+    result = await execute_tool("grist_list_records", {"table_id": "T1"})
+
+    assert "filter" not in grist_calls[0]["params"]
+    assert result["records"][0]["fields"] == {"Name": "Ada", "Status": "Open", "Notes": "long text"}
+
+
+@pytest.mark.asyncio
+async def test_update_merges_duplicate_record_ids(grist_calls):
+    result = await execute_tool("grist_update_records", {
+        "table_id": "T1",
+        "records": [
+            {"id": 1, "fields": {"A": "first", "B": "kept"}},
+            {"id": 2, "fields": {"A": "other"}},
+            {"id": 1, "fields": {"A": "last"}},
+        ]
+    })
+
+    assert result["updated"] == 2
+    assert grist_calls[0]["data"] == {"records": [
+        {"id": 1, "fields": {"A": "last", "B": "kept"}},
+        {"id": 2, "fields": {"A": "other"}},
+    ]}
+
+
+@pytest.mark.asyncio
+async def test_set_context_clears_doc_ids_cached_for_the_request(grist_calls):
+    # Nested calls share the request's cache, as grist_bulk operations do
+    token = tools._DOC_CACHE.set({})
+    try:
+        await execute_tool("grist_list_records", {"table_id": "T1"})
+        await execute_tool("grist_set_context", {"doc_id": "docB"})
+        await execute_tool("grist_list_records", {"table_id": "T1"})
+    finally:
+        tools._DOC_CACHE.reset(token)
+
+    assert [call["doc_id"] for call in grist_calls] == ["doc1", "docB"]
@@ -5,12 +5,18 @@ Provides tool registry and execution for Grist data management tools.
 Implements operations for listing tables and CRUD operations on records.
 """
 
-import json
-from typing import Dict, Any, List
+import os
+import sys
+import asyncio
+import contextvars
+from typing import Dict, Any, List, Callable, Awaitable, Optional, Tuple, NamedTuple
+
+import fastjsonschema
+import orjson
 from grist_client import (
     make_grist_request,
-    transform_table_response,
-    transform_record_response,
+    transform_tables,
+    transform_records,
     resolve_doc_id,
     set_active_context_doc_id,
     get_active_context_doc_id,
@@ -19,9 +25,51 @@ from grist_client import (
 )
 
 
+# Limits for grist_bulk: operations per call, and how many run against Grist at once
+_BULK_MAX_OPERATIONS = 50
+_BULK_CONCURRENCY = 4
+
+# Caps concurrent tool executions against Grist (GRIST_MAX_CONCURRENCY, default 8).
+# Created lazily so it binds to the running event loop.
+_API_SEMAPHORE: Optional[asyncio.Semaphore] = None
+
+# Documents listed by grist_list_docs; static config, built lazily (see refresh_allowed_docs)
+_DOCS_BASE: Optional[List[Dict[str, str]]] = None
+
+# Per-request cache of resolved doc IDs, keyed on the requested doc_id (or None).
+# Set by the outermost execute_tool call, so grist_bulk operations share it.
+_DOC_CACHE: "contextvars.ContextVar[Optional[Dict[Optional[str], str]]]" = contextvars.ContextVar(
+    "grist_doc_cache", default=None
+)
+
+# Tools that only fan out to other tools; those take their own semaphore slots,
+# so holding one here as well could deadlock.
+_UNTHROTTLED_TOOLS = frozenset({"grist_bulk"})
+
+
+def _get_api_semaphore() -> asyncio.Semaphore:
+    """Return the shared tool concurrency semaphore, creating it on first use."""
+    global _API_SEMAPHORE
+
+    if _API_SEMAPHORE is None:
+        max_concurrency = int(os.getenv("GRIST_MAX_CONCURRENCY", "8"))
+        _API_SEMAPHORE = asyncio.Semaphore(max(1, max_concurrency))
+
+    return _API_SEMAPHORE
+
+
 def _get_doc_id(arguments: Dict[str, Any]) -> str:
     """Resolve doc_id from arguments/context/default with validation."""
-    return resolve_doc_id(arguments.get("doc_id"))
+    requested = arguments.get("doc_id")
+    cache = _DOC_CACHE.get()
+    if cache is None:
+        return resolve_doc_id(requested)
+
+    resolved = cache.get(requested)
+    if resolved is None:
+        resolved = resolve_doc_id(requested)
+        cache[requested] = resolved
+    return resolved
 
 
 def _get_table_id(arguments: Dict[str, Any]) -> str:
@@ -36,25 +84,47 @@ def _get_table_id(arguments: Dict[str, Any]) -> str:
     return resolved
 
 
+def _records_endpoint(table_id: str) -> str:
+    """Return the records endpoint path for a table."""
+    return "/tables/" + table_id + "/records"
+
+
+async def _fetch_tables_raw(doc_id: str) -> List[Dict[str, Any]]:
+    """Fetch the raw Grist table listing; list_tables and list_pages each project from it."""
+    response = await make_grist_request("GET", "/tables", doc_id=doc_id)
+    return response.get("tables", [])
+
+
+def _get_docs_base() -> List[Dict[str, str]]:
+    """Return the configured document list, computing it on first use."""
+    global _DOCS_BASE
+
+    if _DOCS_BASE is None:
+        docs = get_allowed_docs()
+        if not docs:
+            default_doc = get_default_doc_id()
+            if not default_doc:
+                raise ValueError("GRIST_DOC_ID environment variable is not set")
+            docs = [{"id": default_doc, "name": default_doc}]
+        _DOCS_BASE = [{"id": doc["id"], "name": doc.get("name", doc["id"])} for doc in docs]
+
+    return _DOCS_BASE
+
+
+def refresh_allowed_docs() -> None:
+    """Drop the cached document list so it is rebuilt from the environment."""
+    global _DOCS_BASE
+    _DOCS_BASE = None
+
+
 # Tool handler functions
 
 async def grist_list_docs(arguments: Dict[str, Any]) -> List[Dict[str, Any]]:
     """List documents this MCP instance may access."""
-    docs = get_allowed_docs()
-    if not docs:
-        default_doc = get_default_doc_id()
-        if not default_doc:
-            raise ValueError("GRIST_DOC_ID environment variable is not set")
-        docs = [{"id": default_doc, "name": default_doc}]
-
     active_doc = get_active_context_doc_id()
     return [
-        {
-            "id": doc["id"],
-            "name": doc.get("name", doc["id"]),
-            "active": bool(active_doc and active_doc == doc["id"])
-        }
-        for doc in docs
+        {**doc, "active": bool(active_doc and active_doc == doc["id"])}
+        for doc in _get_docs_base()
     ]
 
 
@@ -65,6 +135,12 @@ async def grist_set_context(arguments: Dict[str, Any]) -> Dict[str, Any]:
         raise ValueError("doc_id is required")
 
     active_doc = set_active_context_doc_id(doc_id)
+
+    # The active context feeds doc_id resolution, so drop anything cached for this request
+    cache = _DOC_CACHE.get()
+    if cache is not None:
+        cache.clear()
+
     return {
         "active_doc_id": active_doc,
         "default_doc_id": get_default_doc_id()
@@ -94,29 +170,24 @@ async def grist_list_tables(arguments: Dict[str, Any]) -> List[Dict[str, Any]]:
         List of table objects with id and name
     """
     doc_id = _get_doc_id(arguments)
-
-    response = await make_grist_request("GET", "/tables", doc_id=doc_id)
-    grist_tables = response.get("tables", [])
-    simplified_tables = [transform_table_response(table) for table in grist_tables]
-
-    return simplified_tables
+    return transform_tables(await _fetch_tables_raw(doc_id))
 
 
 async def grist_list_pages(arguments: Dict[str, Any]) -> Dict[str, Any]:
     """List page-like table entries for a document."""
     doc_id = _get_doc_id(arguments)
-    tables = await grist_list_tables({"doc_id": doc_id})
+    grist_tables = await _fetch_tables_raw(doc_id)
 
     return {
         "doc_id": doc_id,
         "pages": [
             {
-                "page_id": table["id"],
-                "name": table["name"]
+                "page_id": table.get("id", ""),
+                "name": table.get("id", "")  # Grist uses id as table name
             }
-            for table in tables
+            for table in grist_tables
         ],
-        "count": len(tables)
+        "count": len(grist_tables)
     }
 
 
@@ -129,7 +200,8 @@ async def grist_list_records(arguments: Dict[str, Any]) -> Dict[str, Any]:
             - table_id or page_id (string, required): Table ID/name or page alias
             - doc_id (string, optional): Target Grist document
             - limit (integer, optional): Number of records to retrieve (default: 100, max: 500)
-            - filters (dict, optional): Filter conditions for records
+            - filters (dict, optional): Filter conditions as {column: [values]}, applied by Grist
+            - columns (array, optional): Column names to include in each record
 
     Returns:
         Dict with records array and metadata
@@ -138,19 +210,20 @@ async def grist_list_records(arguments: Dict[str, Any]) -> Dict[str, Any]:
     table_id = _get_table_id(arguments)
     limit = arguments.get("limit", 100)
     filters = arguments.get("filters")
+    columns = arguments.get("columns")
 
-    if not isinstance(limit, int) or limit < 1 or limit > 500:
-        raise ValueError("limit must be between 1 and 500")
-
+    # Grist takes the filter as a JSON-encoded {column: [values]} map, so it is
+    # applied server-side before the limit
     params = {"limit": limit}
     if filters:
-        params["filter"] = filters
+        params["filter"] = orjson.dumps(filters).decode()
 
-    endpoint = f"/tables/{table_id}/records"
+    endpoint = _records_endpoint(table_id)
     response = await make_grist_request("GET", endpoint, params=params, doc_id=doc_id)
 
+    # The records endpoint has no column selection, so project columns here
     grist_records = response.get("records", [])
-    simplified_records = [transform_record_response(record) for record in grist_records]
+    simplified_records = transform_records(grist_records, columns)
 
     return {
         "doc_id": doc_id,
@@ -175,24 +248,15 @@ async def grist_create_records(arguments: Dict[str, Any]) -> Dict[str, Any]:
     """
     doc_id = _get_doc_id(arguments)
     table_id = _get_table_id(arguments)
-    records = arguments.get("records")
-
-    if isinstance(records, str):
-        try:
-            records = json.loads(records)
-        except (json.JSONDecodeError, TypeError) as e:
-            raise ValueError(f"records parameter is a string but not valid JSON: {e}")
-
-    if not records or not isinstance(records, list):
-        raise ValueError("records must be a non-empty array")
+    records = arguments["records"]
 
-    grist_records = [{"fields": record} for record in records]
-    endpoint = f"/tables/{table_id}/records"
-    data = {"records": grist_records}
+    endpoint = _records_endpoint(table_id)
+    # Wrap each record in a single pass; make_grist_request encodes it once with orjson
+    data = {"records": [{"fields": record} for record in records]}
     response = await make_grist_request("POST", endpoint, data=data, doc_id=doc_id)
 
     created_records = response.get("records", [])
-    simplified_records = [transform_record_response(record) for record in created_records]
+    simplified_records = transform_records(created_records)
 
     return {
         "doc_id": doc_id,
@@ -210,38 +274,34 @@ async def grist_update_records(arguments: Dict[str, Any]) -> Dict[str, Any]:
         arguments: Dict with required parameters:
             - table_id or page_id (string, required)
             - doc_id (string, optional)
-            - records (array, required): Array of records with id and fields
+            - records (array, required): Array of records with id and fields.
+              Repeated ids are merged into one update (later fields win).
 
     Returns:
         Dict with success confirmation
     """
     doc_id = _get_doc_id(arguments)
     table_id = _get_table_id(arguments)
-    records = arguments.get("records")
-
-    if isinstance(records, str):
-        try:
-            records = json.loads(records)
-        except (json.JSONDecodeError, TypeError) as e:
-            raise ValueError(f"records parameter is a string but not valid JSON: {e}")
-
-    if not records or not isinstance(records, list):
-        raise ValueError("records must be a non-empty array")
+    records = arguments["records"]
 
+    # Merge repeated ids in one pass so each record is sent once, with the same
+    # result as applying the updates in order
+    merged: Dict[int, Dict[str, Any]] = {}
     for record in records:
-        if "id" not in record:
-            raise ValueError("Each record must have an 'id' field")
-        if "fields" not in record:
-            raise ValueError("Each record must have a 'fields' object")
-
-    endpoint = f"/tables/{table_id}/records"
-    data = {"records": records}
+        existing = merged.get(record["id"])
+        if existing is None:
+            merged[record["id"]] = {"id": record["id"], "fields": dict(record["fields"])}
+        else:
+            existing["fields"].update(record["fields"])
+
+    endpoint = _records_endpoint(table_id)
+    data = {"records": list(merged.values())}
     await make_grist_request("PATCH", endpoint, data=data, doc_id=doc_id)
 
     return {
         "doc_id": doc_id,
         "table_id": table_id,
-        "updated": len(records),
+        "updated": len(merged),
         "success": True
     }
 
@@ -261,22 +321,9 @@ async def grist_delete_records(arguments: Dict[str, Any]) -> Dict[str, Any]:
     """
     doc_id = _get_doc_id(arguments)
     table_id = _get_table_id(arguments)
-    record_ids = arguments.get("record_ids")
-
-    if isinstance(record_ids, str):
-        try:
-            record_ids = json.loads(record_ids)
-        except (json.JSONDecodeError, TypeError) as e:
-            raise ValueError(f"record_ids parameter is a string but not valid JSON: {e}")
-
-    if not record_ids or not isinstance(record_ids, list):
-        raise ValueError("record_ids must be a non-empty array")
-
-    for record_id in record_ids:
-        if not isinstance(record_id, int):
-            raise ValueError("All record_ids must be integers")
+    record_ids = arguments["record_ids"]
 
-    endpoint = f"/tables/{table_id}/records"
+    endpoint = _records_endpoint(table_id)
     data = {"records": record_ids}
     await make_grist_request("DELETE", endpoint, data=data, doc_id=doc_id)
 
@@ -288,14 +335,68 @@ async def grist_delete_records(arguments: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+async def grist_bulk(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run several tool calls in a single request.
+
+    Operations run concurrently (at most _BULK_CONCURRENCY at a time), so they
+    must not depend on each other's side effects. A failing operation is
+    reported in its result entry and does not abort the rest of the batch.
+
+    Args:
+        arguments: Dict with required parameters:
+            - operations (array, required): Objects with "tool" and optional "arguments"
+
+    Returns:
+        Dict with one result entry per operation, in request order
+    """
+    operations = arguments["operations"]
+
+    if any(operation["tool"] == "grist_bulk" for operation in operations):
+        raise ValueError("grist_bulk operations cannot be nested")
+
+    semaphore = asyncio.Semaphore(_BULK_CONCURRENCY)
+
+    async def run_operation(operation: Dict[str, Any]) -> Dict[str, Any]:
+        tool_name = operation["tool"]
+        async with semaphore:
+            try:
+                arguments = operation.get("arguments")
+                # DarcyIQ may send each operation's arguments as a JSON string too
+                if isinstance(arguments, str):
+                    try:
+                        arguments = orjson.loads(arguments)
+                    except orjson.JSONDecodeError as e:
+                        raise ValueError(f"arguments parameter is a string but not valid JSON: {e}")
+                result = await execute_tool(tool_name, arguments)
+            except Exception as e:
+                return {"tool": tool_name, "ok": False, "error": str(e)}
+        return {"tool": tool_name, "ok": True, "result": result}
+
+    results = await asyncio.gather(*(run_operation(operation) for operation in operations))
+
+    return {
+        "results": results,
+        "count": len(results),
+        "failed": sum(1 for result in results if not result["ok"])
+    }
+
+
 # Tool Registry
 
-def get_tool_registry() -> Dict[str, Dict[str, Any]]:
+class ToolDef(NamedTuple):
+    """Definition of an MCP tool: description, JSON Schema for arguments, and handler."""
+    description: str
+    schema: Dict[str, Any]
+    handler: Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+def _build_tool_registry() -> Dict[str, ToolDef]:
     """
-    Get the registry of all available Grist MCP tools.
+    Build the registry of all available Grist MCP tools.
 
     Returns:
-        Dict mapping tool names to their definitions (description, schema, handler)
+        Dict mapping tool names to their ToolDef entries
     """
     doc_id_schema = {
         "type": "string",
@@ -315,18 +416,18 @@ def get_tool_registry() -> Dict[str, Dict[str, Any]]:
     }
 
     return {
-        "grist_list_docs": {
-            "description": "List documents available to this MCP instance",
-            "schema": {
+        "grist_list_docs": ToolDef(
+            description="List documents available to this MCP instance",
+            schema={
                 "type": "object",
                 "properties": {},
                 "required": []
             },
-            "handler": grist_list_docs
-        },
-        "grist_set_context": {
-            "description": "Set the active Grist document context",
-            "schema": {
+            handler=grist_list_docs
+        ),
+        "grist_set_context": ToolDef(
+            description="Set the active Grist document context",
+            schema={
                 "type": "object",
                 "properties": {
                     "doc_id": {
@@ -336,42 +437,42 @@ def get_tool_registry() -> Dict[str, Dict[str, Any]]:
                 },
                 "required": ["doc_id"]
             },
-            "handler": grist_set_context
-        },
-        "grist_get_context": {
-            "description": "Get current document context",
-            "schema": {
+            handler=grist_set_context
+        ),
+        "grist_get_context": ToolDef(
+            description="Get current document context",
+            schema={
                 "type": "object",
                 "properties": {},
                 "required": []
             },
-            "handler": grist_get_context
-        },
-        "grist_list_tables": {
-            "description": "List all tables in a Grist document",
-            "schema": {
+            handler=grist_get_context
+        ),
+        "grist_list_tables": ToolDef(
+            description="List all tables in a Grist document",
+            schema={
                 "type": "object",
                 "properties": {
                     "doc_id": doc_id_schema
                 },
                 "required": []
             },
-            "handler": grist_list_tables
-        },
-        "grist_list_pages": {
-            "description": "List page-like table entries in a Grist document",
-            "schema": {
+            handler=grist_list_tables
+        ),
+        "grist_list_pages": ToolDef(
+            description="List page-like table entries in a Grist document",
+            schema={
                 "type": "object",
                 "properties": {
                     "doc_id": doc_id_schema
                 },
                 "required": []
             },
-            "handler": grist_list_pages
-        },
-        "grist_list_records": {
-            "description": "Retrieve records from a specific table/page with optional filters and limit",
-            "schema": {
+            handler=grist_list_pages
+        ),
+        "grist_list_records": ToolDef(
+            description="Retrieve records from a specific table/page with optional filters and limit",
+            schema={
                 "type": "object",
                 "properties": {
                     **table_or_page_props,
@@ -383,22 +484,33 @@ def get_tool_registry() -> Dict[str, Dict[str, Any]]:
                     },
                     "filters": {
                         "type": "object",
-                        "description": "Optional filter conditions for records"
+                        "description": "Optional filter as {column: [allowed values]}, e.g. {\"Status\": [\"Open\"]}",
+                        "additionalProperties": {
+                            "type": "array"
+                        }
+                    },
+                    "columns": {
+                        "type": "array",
+                        "description": "Optional list of column names to return for each record",
+                        "items": {
+                            "type": "string"
+                        }
                     }
                 },
                 "required": []
             },
-            "handler": grist_list_records
-        },
-        "grist_create_records": {
-            "description": "Create new records in a table/page",
-            "schema": {
+            handler=grist_list_records
+        ),
+        "grist_create_records": ToolDef(
+            description="Create new records in a table/page",
+            schema={
                 "type": "object",
                 "properties": {
                     **table_or_page_props,
                     "records": {
                         "type": "array",
                         "description": "Array of record objects with field values",
+                        "minItems": 1,
                         "items": {
                             "type": "object"
                         }
@@ -406,17 +518,18 @@ def get_tool_registry() -> Dict[str, Dict[str, Any]]:
                 },
                 "required": ["records"]
             },
-            "handler": grist_create_records
-        },
-        "grist_update_records": {
-            "description": "Update existing records in a table/page by ID",
-            "schema": {
+            handler=grist_create_records
+        ),
+        "grist_update_records": ToolDef(
+            description="Update existing records in a table/page by ID",
+            schema={
                 "type": "object",
                 "properties": {
                     **table_or_page_props,
                     "records": {
                         "type": "array",
                         "description": "Array of records with id and fields to update",
+                        "minItems": 1,
                         "items": {
                             "type": "object",
                             "properties": {
@@ -435,17 +548,18 @@ def get_tool_registry() -> Dict[str, Dict[str, Any]]:
                 },
                 "required": ["records"]
             },
-            "handler": grist_update_records
-        },
-        "grist_delete_records": {
-            "description": "Delete records from a table/page by ID",
-            "schema": {
+            handler=grist_update_records
+        ),
+        "grist_delete_records": ToolDef(
+            description="Delete records from a table/page by ID",
+            schema={
                 "type": "object",
                 "properties": {
                     **table_or_page_props,
                     "record_ids": {
                         "type": "array",
                         "description": "Array of record IDs to delete",
+                        "minItems": 1,
                         "items": {
                             "type": "integer"
                         }
@@ -453,11 +567,132 @@ def get_tool_registry() -> Dict[str, Dict[str, Any]]:
                 },
                 "required": ["record_ids"]
             },
-            "handler": grist_delete_records
-        }
+            handler=grist_delete_records
+        ),
+        "grist_bulk": ToolDef(
+            description="Run several Grist tool calls concurrently in one request; each result reports ok/error independently",
+            schema={
+                "type": "object",
+                "properties": {
+                    "operations": {
+                        "type": "array",
+                        "description": f"Tool calls to run (max {_BULK_MAX_OPERATIONS}); they run concurrently, so do not rely on ordering",
+                        "minItems": 1,
+                        "maxItems": _BULK_MAX_OPERATIONS,
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "tool": {
+                                    "type": "string",
+                                    "description": "Name of the tool to call"
+                                },
+                                "arguments": {
+                                    "type": ["object", "string", "null"],
+                                    "description": "Arguments for the tool (object, or object encoded as a JSON string)"
+                                }
+                            },
+                            "required": ["tool"]
+                        }
+                    }
+                },
+                "required": ["operations"]
+            },
+            handler=grist_bulk
+        )
     }
 
 
+# The registry is static, so build it (and the name -> handler table) once
+_TOOL_REGISTRY = _build_tool_registry()
+_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[Any]]] = {
+    sys.intern(name): tool.handler for name, tool in _TOOL_REGISTRY.items()
+}
+
+# Argument validators compiled from each tool's JSON Schema
+_VALIDATORS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    name: fastjsonschema.compile(tool.schema) for name, tool in _TOOL_REGISTRY.items()
+}
+
+# Array/object arguments per tool, which some clients send as JSON strings
+_JSON_ARGUMENTS: Dict[str, Tuple[str, ...]] = {
+    name: tuple(
+        prop_name
+        for prop_name, prop in tool.schema["properties"].items()
+        if prop.get("type") in ("array", "object")
+    )
+    for name, tool in _TOOL_REGISTRY.items()
+}
+
+
+def _decode_json_arguments(tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Decode array/object arguments that arrived as JSON strings.
+
+    DarcyIQ sends e.g. records as '[{"id": 1, ...}]' rather than an array.
+    Returns a new dict if anything was decoded; the input is left untouched.
+    """
+    decoded = arguments
+    for name in _JSON_ARGUMENTS[tool_name]:
+        value = arguments.get(name)
+        if isinstance(value, str):
+            try:
+                parsed = orjson.loads(value)
+            except orjson.JSONDecodeError as e:
+                raise ValueError(f"{name} parameter is a string but not valid JSON: {e}")
+            if decoded is arguments:
+                decoded = dict(arguments)
+            decoded[name] = parsed
+    return decoded
+
+
+def _validate_arguments(tool_name: str, arguments: Dict[str, Any]) -> None:
+    """Validate tool arguments against the tool's schema, raising ValueError."""
+    try:
+        _VALIDATORS[tool_name](arguments)
+    except fastjsonschema.JsonSchemaValueException as e:
+        # fastjsonschema names the root "data"; report argument names instead
+        message = e.message
+        if message.startswith("data."):
+            message = message[len("data."):]
+        elif message.startswith("data "):
+            message = "arguments " + message[len("data "):]
+        raise ValueError(message)
+
+    _check_strict_integers(_TOOL_REGISTRY[tool_name].schema, arguments, "")
+
+
+def _check_strict_integers(schema: Dict[str, Any], value: Any, path: str) -> None:
+    """
+    Reject non-int values where the schema says integer.
+
+    fastjsonschema accepts integral floats such as 1.0 as integers, which would
+    reach Grist as e.g. limit=5.0; record IDs and limits must be real ints.
+    """
+    if schema.get("type") == "integer":
+        # type() rather than isinstance() also rejects booleans
+        if type(value) is not int:
+            raise ValueError(f"{path or 'arguments'} must be integer")
+    elif isinstance(value, dict) and "properties" in schema:
+        for name, prop_schema in schema["properties"].items():
+            if name in value:
+                _check_strict_integers(prop_schema, value[name], f"{path}.{name}" if path else name)
+    elif isinstance(value, list) and "items" in schema:
+        for index, item in enumerate(value):
+            _check_strict_integers(schema["items"], item, f"{path}[{index}]")
+
+
+def get_tool_registry() -> Dict[str, ToolDef]:
+    """
+    Get the registry of all available Grist MCP tools.
+
+    The registry is shared; callers must not modify it.
+
+    Returns:
+        Dict mapping tool names to their ToolDef (description, schema, handler)
+    """
+    return _TOOL_REGISTRY
+
+
 async def execute_tool(tool_name: str, arguments: Dict[str, Any]) -> Any:
     """
     Execute a Grist tool by name with given arguments.
@@ -472,18 +707,27 @@ async def execute_tool(tool_name: str, arguments: Dict[str, Any]) -> Any:
     Raises:
         ValueError: If tool name is unknown or execution fails
     """
-    registry = get_tool_registry()
-
     # Some MCP clients send null for tools with no args; normalize to empty object.
     if arguments is None:
         arguments = {}
     if not isinstance(arguments, dict):
         raise ValueError("Tool arguments must be an object")
 
-    if tool_name not in registry:
+    handler = _HANDLERS.get(tool_name)
+    if handler is None:
         raise ValueError(f"Unknown tool: {tool_name}")
 
-    tool = registry[tool_name]
-    handler = tool["handler"]
+    arguments = _decode_json_arguments(tool_name, arguments)
+    _validate_arguments(tool_name, arguments)
+
+    # Start a doc_id cache for this request unless an outer call (grist_bulk) already has
+    token = _DOC_CACHE.set({}) if _DOC_CACHE.get() is None else None
+    try:
+        if tool_name in _UNTHROTTLED_TOOLS:
+            return await handler(arguments)
 
-    return await handler(arguments)
+        async with _get_api_semaphore():
+            return await handler(arguments)
+    finally:
+        if token is not None:
+            _DOC_CACHE.reset(token)
@@ -7,61 +7,254 @@ Run this before starting the MCP server to ensure configuration is correct.
 
 import os
 import sys
+import json
+import time
 import asyncio
+import hashlib
+import argparse
 from pathlib import Path
+from typing import Any, Dict, List
 
-# Add parent directory to path to import grist_client
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# mcp-server/, which holds grist_client and .env
+_SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-from dotenv import load_dotenv
-from grist_client import make_grist_request
+# Make grist_client importable when run as a script; skip if already on the path
+if _SERVER_DIR not in sys.path:
+    sys.path.insert(0, _SERVER_DIR)
 
-# Load environment variables
-load_dotenv()
+# Upper bound, in seconds, on each of the concurrently run check requests
+PING_TIMEOUT_SECONDS = 5
 
+# Successful results are reused for this many seconds unless --force is given
+DEFAULT_MAX_AGE_SECONDS = 60
 
-async def test_connection():
-    """Test Grist API connection by listing tables."""
-    print("Testing Grist API connection...")
-    print(f"API URL: {os.getenv('GRIST_API_URL', 'https://docs.getgrist.com')}")
-    print(f"Document ID: {os.getenv('GRIST_DOC_ID', 'Not set')}")
-    print(f"API Key configured: {'Yes' if os.getenv('GRIST_API_KEY') else 'No'}")
-    print()
+# Report header; the trailing newline becomes the blank separator line
+_BANNER = (
+    "Testing Grist API connection...\n"
+    "API URL: {url}\n"
+    "Document ID: {doc}\n"
+    "API Key configured: {key}\n"
+)
 
+
+def _cache_path() -> Path:
+    """Location of the cached health result."""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(cache_home) / "grist-mcp" / "health.json"
+
+
+def _cache_key(api_url: str, doc_id: str, api_key: str) -> str:
+    """Identify a configuration without storing the API key itself."""
+    return hashlib.sha256(f"{api_url}\0{doc_id}\0{api_key[:8]}".encode()).hexdigest()
+
+
+def _load_cached_tables(key: str, max_age: float):
+    """Return cached table IDs for key if fresh, else None."""
+    try:
+        with open(_cache_path(), encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(cached, dict) or cached.get("key") != key:
+        return None
+
+    # Treat anything malformed as a miss rather than trusting the file
+    timestamp = cached.get("timestamp")
+    tables = cached.get("tables")
+    if type(timestamp) not in (int, float):
+        return None
+    if not isinstance(tables, list) or not all(isinstance(table_id, str) for table_id in tables):
+        return None
+
+    if time.time() - timestamp >= max_age:
+        return None
+    return tables
+
+
+def _store_cached_tables(key: str, tables) -> None:
+    """Persist a successful result; failures to write are ignored."""
+    path = _cache_path()
     try:
-        # Try to list tables in the document
-        response = await make_grist_request("GET", "/tables")
-        tables = response.get("tables", [])
-
-        print(f"✅ SUCCESS! Retrieved {len(tables)} table(s)")
-        print()
-        if tables:
-            print("Tables found:")
-            for table in tables:
-                table_id = table.get("id", "Unknown")
-                print(f"  - {table_id}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "timestamp": time.time(), "tables": tables}, f)
+    except OSError:
+        pass
+
+
+def _table_lines(table_ids, cached: bool = False, verbose: bool = False) -> List[str]:
+    """Success summary lines for a list of table IDs; names are listed only when verbose."""
+    marker = " (cached)" if cached else ""
+    lines = [f"✅ SUCCESS! Retrieved {len(table_ids)} table(s){marker}", ""]
+    if table_ids:
+        if verbose:
+            lines.append("Tables found:")
+            lines.extend(f"  - {table_id}" for table_id in table_ids)
         else:
-            print("No tables found in document (this is okay for empty documents)")
+            lines.append("Run with --verbose to list them")
+    else:
+        lines.append("No tables found in document (this is okay for empty documents)")
+
+    lines.append("")
+    lines.append("Your Grist API connection is working correctly!")
+    return lines
+
+
+def _load_env() -> None:
+    """Load environment variables from mcp-server/.env."""
+    # Imported here so --help and argument errors skip the dotenv import
+    from dotenv import load_dotenv
+
+    # Load the file directly rather than letting python-dotenv search
+    # upwards from the calling frame
+    load_dotenv(os.path.join(_SERVER_DIR, ".env"))
+
+
+def _missing_settings() -> List[str]:
+    """Names of required settings that are unset or empty."""
+    return [name for name in ("GRIST_API_KEY", "GRIST_DOC_ID") if not os.environ.get(name)]
+
+
+async def test_connection(
+    max_age: float = DEFAULT_MAX_AGE_SECONDS,
+    force: bool = False,
+    as_json: bool = False,
+    verbose: bool = False
+):
+    """
+    Test Grist API connection by listing tables and reading document metadata.
 
-        print()
-        print("Your Grist API connection is working correctly!")
+    Environment variables must already be loaded (see _load_env). Output is
+    collected and written to stdout in a single call.
+
+    Args:
+        max_age: Reuse a cached successful result younger than this many seconds
+        force: Ignore any cached result and always call the API
+        as_json: Emit one JSON object ({ok, cached, tables, error}) instead of the report
+        verbose: List table names in the report, not just the count
+    """
+    lines: List[str] = []
+    summary: Dict[str, Any] = {"ok": False, "cached": False, "tables": [], "error": None}
+    try:
+        return await _run_check(lines, summary, max_age, force, verbose)
+    finally:
+        if as_json:
+            sys.stdout.write(json.dumps(summary, separators=(",", ":")) + "\n")
+        else:
+            sys.stdout.write("\n".join(lines) + "\n")
+
+
+async def _run_check(
+    lines: List[str],
+    summary: Dict[str, Any],
+    max_age: float,
+    force: bool,
+    verbose: bool
+) -> bool:
+    """Run the connection check, appending report lines to lines and filling in summary."""
+    api_url = os.environ.get('GRIST_API_URL', 'https://docs.getgrist.com')
+    doc_id = os.environ.get('GRIST_DOC_ID', 'Not set')
+    api_key = os.environ.get('GRIST_API_KEY', '')
+    api_key_set = bool(api_key)
+
+    lines.append(_BANNER.format(url=api_url, doc=doc_id, key="Yes" if api_key_set else "No"))
+
+    key = _cache_key(api_url, doc_id, api_key)
+    if not force and max_age > 0:
+        cached_tables = _load_cached_tables(key, max_age)
+        if cached_tables is not None:
+            summary.update(ok=True, cached=True, tables=cached_tables)
+            lines.extend(_table_lines(cached_tables, cached=True, verbose=verbose))
+            return True
+
+    # Imported here so runs answered from the cache never load httpx
+    from grist_client import create_client, make_grist_request
+
+    try:
+        # List tables and fetch document metadata concurrently. Each request
+        # has its own bound so an unresponsive instance cannot hang CI.
+        async with create_client() as client:
+            tables_response, doc_response = await asyncio.gather(
+                asyncio.wait_for(
+                    make_grist_request("GET", "/tables", client=client),
+                    timeout=PING_TIMEOUT_SECONDS
+                ),
+                asyncio.wait_for(
+                    make_grist_request("GET", "", client=client),
+                    timeout=PING_TIMEOUT_SECONDS
+                ),
+                return_exceptions=True
+            )
+
+        # Either failure fails the check; re-raise into the handlers below
+        for result in (tables_response, doc_response):
+            if isinstance(result, BaseException):
+                raise result
+
+        table_ids = [table.get("id", "Unknown") for table in tables_response.get("tables", [])]
+
+        _store_cached_tables(key, table_ids)
+        summary.update(ok=True, tables=table_ids)
+        lines.append(f"Document name: {doc_response.get('name', 'Unknown')}")
+        lines.extend(_table_lines(table_ids, verbose=verbose))
         return True
 
+    except asyncio.TimeoutError:
+        summary["error"] = f"Grist API did not respond within {PING_TIMEOUT_SECONDS}s"
+        lines.append(f"❌ ERROR: {summary['error']}")
+        return False
     except ValueError as e:
-        print(f"❌ ERROR: {str(e)}")
-        print()
-        print("Common issues:")
-        print("  - Check GRIST_API_KEY is valid (from Profile Settings -> API)")
-        print("  - Check GRIST_DOC_ID matches your document URL")
-        print("  - Check GRIST_API_URL is correct")
-        print("  - Ensure API key has access to the document")
+        summary["error"] = str(e)
+        lines.extend([
+            f"❌ ERROR: {str(e)}",
+            "",
+            "Common issues:",
+            "  - Check GRIST_API_KEY is valid (from Profile Settings -> API)",
+            "  - Check GRIST_DOC_ID matches your document URL",
+            "  - Check GRIST_API_URL is correct",
+            "  - Ensure API key has access to the document"
+        ])
         return False
     except Exception as e:
-        print(f"❌ UNEXPECTED ERROR: {str(e)}")
+        summary["error"] = str(e)
+        lines.append(f"❌ UNEXPECTED ERROR: {str(e)}")
         return False
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify Grist API credentials and connectivity.")
+    parser.add_argument(
+        "--max-age", type=float, default=DEFAULT_MAX_AGE_SECONDS, metavar="SECONDS",
+        help=f"reuse a successful result younger than this (default: {DEFAULT_MAX_AGE_SECONDS})"
+    )
+    parser.add_argument("--force", action="store_true", help="ignore the cached result")
+    parser.add_argument("--verbose", "-v", action="store_true", help="list table names, not just the count")
+    parser.add_argument("--json", action="store_true", help="print a single JSON object instead of a report")
+    args = parser.parse_args()
+
+    _load_env()
+
+    # Fail fast on missing configuration, before starting an event loop or importing httpx
+    missing = _missing_settings()
+    if missing:
+        error = f"{', '.join(missing)} not set"
+        if args.json:
+            sys.stdout.write(json.dumps(
+                {"ok": False, "cached": False, "tables": [], "error": error},
+                separators=(",", ":")
+            ) + "\n")
+        else:
+            sys.stdout.write(f"❌ ERROR: {error}\n")
+        sys.exit(2)
+
+    # Use uvloop's faster event loop when it is installed
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     # Run the test
-    success = asyncio.run(test_connection())
+    success = asyncio.run(test_connection(max_age=args.max_age, force=args.force, as_json=args.json, verbose=args.verbose))
     sys.exit(0 if success else 1)